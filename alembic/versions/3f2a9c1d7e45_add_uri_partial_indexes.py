@@ -0,0 +1,42 @@
+"""add uri partial indexes
+
+Revision ID: 3f2a9c1d7e45
+Revises: 8c439dc4dee0
+Create Date: 2026-10-15 09:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7e45'
+down_revision: Union[str, Sequence[str], None] = '8c439dc4dee0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_mogi_site',
+        'extract_mogi',
+        ['site'],
+        unique=False,
+        sqlite_where=sa.text('site IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_mogi_fb',
+        'extract_mogi',
+        ['facebook_link'],
+        unique=False,
+        sqlite_where=sa.text('facebook_link IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mogi_fb', table_name='extract_mogi')
+    op.drop_index('ix_mogi_site', table_name='extract_mogi')
@@ -0,0 +1,33 @@
+"""add nome_empresa index
+
+Revision ID: a71d4e2b9c08
+Revises: 3f2a9c1d7e45
+Create Date: 2026-10-15 10:02:17.884310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71d4e2b9c08'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f('ix_extract_mogi_nome_empresa'),
+        'extract_mogi',
+        ['nome_empresa'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_extract_mogi_nome_empresa'), table_name='extract_mogi')
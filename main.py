@@ -9,6 +9,8 @@ from tkinter import filedialog
 from pathlib import Path
 import asyncio
 import logging
+import time
+from collections import deque
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
@@ -16,19 +18,38 @@ from textual.worker import Worker, WorkerState
 from textual import work
 
 from src.ui.widgets import ExtractMogiWidget
-from src.database.db_handler import SessionLocal, engine, Base
+from src.database.db_handler import SessionLocal, ensure_schema
 from src.database.models import ExtractMogi
-from src.processors.async_processor import AsyncCSVProcessor
+from src.processors.async_processor import AsyncCSVProcessor, read_company_names
 from src.exporters.data_exporter import DataExporter
 
 # Configuração de logging
+# O arquivo de log recebe apenas avisos e erros para não pesar no processamento
+file_handler = logging.FileHandler("extractmogi.log")
+file_handler.setLevel(logging.WARNING)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("extractmogi.log"), logging.StreamHandler()],
+    handlers=[file_handler, logging.StreamHandler()],
 )
 logger = logging.getLogger(__name__)
 
+# Intervalo mínimo (s) entre atualizações de progresso com o mesmo percentual
+PROGRESS_INTERVAL = 0.2
+
+# Intervalo (s) para inserir na tabela as linhas acumuladas
+ROW_FLUSH_INTERVAL = 0.1
+
+# Campos exibidos na coluna Status da tabela, na ordem de exibição
+_STATUS_KEYS = (
+    ("telefone", "Tel✓"),
+    ("site", "Site✓"),
+    ("facebook_link", "FB✓"),
+    ("email", "Email✓"),
+    ("celular_whatsapp", "WhatsApp✓"),
+)
+
 
 class ExtractMogiApp(App):
     """Aplicação principal do ExtractMogi com interface Textual."""
@@ -84,10 +105,19 @@ class ExtractMogiApp(App):
         self.db_session = None
         self.processing = False
         self.stats = {}
+        self._tk_root = None
+
+        # Sessão de leitura da UI; o worker de processamento usa a sua própria
+        self.read_session = SessionLocal()
 
-        # Cria as tabelas no banco se não existirem
-        Base.metadata.create_all(bind=engine)
-        logger.info("Banco de dados inicializado")
+        # Linhas aguardando inserção em lote na tabela
+        self._pending_rows = deque()
+        self._flush_timer = None
+
+        # Atalhos usados nos callbacks do processamento (chamados por empresa)
+        self._cft = self.call_from_thread
+        self._last_pct = -1
+        self._last_progress_t = 0.0
 
     def compose(self) -> ComposeResult:
         """Compõe a interface da aplicação."""
@@ -97,6 +127,26 @@ class ExtractMogiApp(App):
         """Executado quando a aplicação é montada."""
         self.update_status("Aguardando seleção de arquivo... [Pressione I]")
 
+    def on_unmount(self) -> None:
+        """Executado quando a aplicação é desmontada."""
+        self.read_session.close()
+
+        if self._tk_root is not None:
+            self._tk_root.destroy()
+            self._tk_root = None
+
+    def _get_tk_root(self) -> tk.Tk:
+        """
+        Retorna a janela raiz oculta do tkinter, criando-a no primeiro uso.
+        Reutilizada em todas as importações para não reiniciar o Tcl a cada uma.
+        """
+        if self._tk_root is None:
+            root = tk.Tk()
+            root.withdraw()
+            root.wm_attributes("-topmost", True)
+            self._tk_root = root
+        return self._tk_root
+
     def action_import_file(self) -> None:
         """
         Ação para importar arquivo CSV.
@@ -107,27 +157,21 @@ class ExtractMogiApp(App):
             return
 
         try:
-            # Inicializa o tkinter sem mostrar a janela principal
-            root = tk.Tk()
-            root.withdraw()
-            root.wm_attributes("-topmost", True)
-
             # Abre a janela de seleção de arquivo do Windows
             file_path = filedialog.askopenfilename(
+                parent=self._get_tk_root(),
                 title="Selecione o arquivo CSV de empresas",
                 filetypes=[("Arquivos CSV", "*.csv"), ("Todos os arquivos", "*.*")],
                 initialdir=os.path.join(os.getcwd(), "data"),
             )
 
-            root.destroy()
-
             if file_path:
                 self._load_csv_file(file_path)
             else:
                 self.update_status("⚠ Seleção cancelada")
 
         except Exception as e:
-            logger.error(f"Erro ao importar arquivo: {e}")
+            logger.error("Erro ao importar arquivo: %s", e)
             self.update_status(f"❌ Erro ao importar: {str(e)}")
 
     def _load_csv_file(self, file_path: str) -> None:
@@ -141,32 +185,21 @@ class ExtractMogiApp(App):
             filename = os.path.basename(file_path)
             self.selected_file = file_path
 
-            # Cria uma sessão temporária para validar o CSV
-            temp_session = SessionLocal()
-            processor = AsyncCSVProcessor(
-                csv_path=file_path,
-                db_session=temp_session,
-                model_class=ExtractMogi,
-                headless=True,
-            )
-
-            # Lê e valida o CSV
-            companies = processor.read_csv()
-            temp_session.close()
+            # Conta as empresas direto do CSV, sem abrir sessão no banco,
+            # com a mesma leitura usada no processamento
+            total = len(read_company_names(file_path))
 
             # Atualiza a UI
-            self.update_status(
-                f"✓ Arquivo carregado: {filename} ({len(companies)} empresas)"
-            )
+            self.update_status(f"✓ Arquivo carregado: {filename} ({total} empresas)")
             self.update_progress(f"Pronto para processar. Pressione [P] para iniciar.")
 
-            logger.info(f"CSV carregado: {filename} com {len(companies)} empresas")
+            logger.info("CSV carregado: %s com %s empresas", filename, total)
 
         except FileNotFoundError as e:
             self.update_status(f"❌ Arquivo não encontrado: {str(e)}")
             self.selected_file = None
         except Exception as e:
-            logger.error(f"Erro ao carregar CSV: {e}")
+            logger.error("Erro ao carregar CSV: %s", e)
             self.update_status(f"❌ Erro ao carregar CSV: {str(e)}")
             self.selected_file = None
 
@@ -185,6 +218,7 @@ class ExtractMogiApp(App):
 
         # Marca como processando
         self.processing = True
+        self._last_pct = -1
         self.update_status(f"🚀 Iniciando processamento...")
 
         # Inicia o processamento assíncrono
@@ -226,7 +260,7 @@ class ExtractMogiApp(App):
             await self._on_processing_complete()
 
         except Exception as e:
-            logger.error(f"Erro durante processamento: {e}")
+            logger.error("Erro durante processamento: %s", e)
             self.call_from_thread(
                 self.update_status, f"❌ Erro durante processamento: {str(e)}"
             )
@@ -245,8 +279,17 @@ class ExtractMogiApp(App):
             total: Total de empresas
             percentage: Percentual completo
         """
-        progress_text = f"Progresso: {current}/{total} ({percentage}%)"
-        self.call_from_thread(self.update_progress, progress_text)
+        # Só atualiza a UI quando o percentual muda ou a cada 200ms
+        now = time.monotonic()
+        if (
+            percentage == self._last_pct
+            and now - self._last_progress_t < PROGRESS_INTERVAL
+        ):
+            return
+        self._last_pct = percentage
+        self._last_progress_t = now
+
+        self._cft(self.update_progress, f"Progresso: {current}/{total} ({percentage}%)")
 
     async def _on_company_start(self, nome_empresa: str) -> None:
         """
@@ -255,9 +298,8 @@ class ExtractMogiApp(App):
         Args:
             nome_empresa: Nome da empresa
         """
-        status_text = f"🔍 Processando: {nome_empresa}"
-        self.call_from_thread(self.update_status, status_text)
-        logger.info(f"Iniciando: {nome_empresa}")
+        self._cft(self.update_status, f"🔍 Processando: {nome_empresa}")
+        logger.info("Iniciando: %s", nome_empresa)
 
     async def _on_company_complete(self, nome_empresa: str, data: dict) -> None:
         """
@@ -268,23 +310,13 @@ class ExtractMogiApp(App):
             data: Dados extraídos
         """
         # Determina o status baseado nos dados encontrados
-        status_parts = []
-
-        if data.get("telefone"):
-            status_parts.append("Tel✓")
-        if data.get("site"):
-            status_parts.append("Site✓")
-        if data.get("facebook_link"):
-            status_parts.append("FB✓")
-        if data.get("email"):
-            status_parts.append("Email✓")
-        if data.get("celular_whatsapp"):
-            status_parts.append("WhatsApp✓")
-
-        status = " | ".join(status_parts) if status_parts else "Sem dados"
+        get = data.get
+        status = (
+            " | ".join(label for key, label in _STATUS_KEYS if get(key)) or "Sem dados"
+        )
 
         # Adiciona linha na tabela
-        self.call_from_thread(
+        self._cft(
             self._add_table_row,
             nome_empresa,
             data.get("telefone", "—"),
@@ -292,7 +324,7 @@ class ExtractMogiApp(App):
             status,
         )
 
-        logger.info(f"Concluído: {nome_empresa} - {status}")
+        logger.info("Concluído: %s - %s", nome_empresa, status)
 
     async def _on_error(self, nome_empresa: str, error_message: str) -> None:
         """
@@ -303,9 +335,9 @@ class ExtractMogiApp(App):
             error_message: Mensagem de erro
         """
         # Adiciona linha na tabela com erro
-        self.call_from_thread(self._add_table_row, nome_empresa, "—", "—", f"❌ Erro")
+        self._cft(self._add_table_row, nome_empresa, "—", "—", f"❌ Erro")
 
-        logger.error(f"Erro em {nome_empresa}: {error_message}")
+        logger.error("Erro em %s: %s", nome_empresa, error_message)
 
     async def _on_captcha_detected(self, nome_empresa: str, message: str) -> None:
         """
@@ -315,13 +347,13 @@ class ExtractMogiApp(App):
             nome_empresa: Nome da empresa
             message: Mensagem sobre o CAPTCHA
         """
-        status_text = f"🤖 CAPTCHA DETECTADO para: {nome_empresa}"
-        self.call_from_thread(self.update_status, status_text)
+        cft = self._cft
+        cft(self.update_status, f"🤖 CAPTCHA DETECTADO para: {nome_empresa}")
 
         # Adiciona linha na tabela indicando CAPTCHA
-        self.call_from_thread(self._add_table_row, nome_empresa, "—", "—", "🤖 CAPTCHA")
+        cft(self._add_table_row, nome_empresa, "—", "—", "🤖 CAPTCHA")
 
-        logger.warning(f"CAPTCHA: {nome_empresa} - {message}")
+        logger.warning("CAPTCHA: %s - %s", nome_empresa, message)
 
     async def _on_processing_complete(self) -> None:
         """Callback quando todo o processamento é concluído."""
@@ -332,6 +364,7 @@ class ExtractMogiApp(App):
             f"Total: {stats['total']} | "
             f"Sucesso: {stats['com_dados']} | "
             f"Sem dados: {stats['sem_dados']} | "
+            f"Já processadas: {stats['ignoradas']} | "
             f"Erros: {stats['erros']}"
         )
 
@@ -340,13 +373,14 @@ class ExtractMogiApp(App):
             self.update_progress, "Pressione [E] para exportar ou [I] para novo arquivo"
         )
 
-        logger.info(f"Processamento finalizado: {stats}")
+        logger.info("Processamento finalizado: %s", stats)
 
     def _add_table_row(
         self, empresa: str, telefone: str, facebook: str, status: str
     ) -> None:
         """
-        Adiciona uma linha na tabela de dados.
+        Enfileira uma linha para a tabela de dados.
+        As linhas são inseridas em lote por _flush_rows a cada ROW_FLUSH_INTERVAL.
 
         Args:
             empresa: Nome da empresa
@@ -354,16 +388,33 @@ class ExtractMogiApp(App):
             facebook: Link do Facebook
             status: Status do processamento
         """
-        try:
-            table = self.query_one("#data_table")
+        # Trunca valores muito longos
+        if not telefone:
+            telefone = "—"
+        elif len(telefone) > 20:
+            telefone = telefone[:20]
+        facebook_short = "Link FB" if facebook and facebook != "—" else "—"
+
+        self._pending_rows.append((empresa, telefone, facebook_short, status))
+
+        if self._flush_timer is None:
+            self._flush_timer = self.set_timer(ROW_FLUSH_INTERVAL, self._flush_rows)
+
+    def _flush_rows(self) -> None:
+        """Insere na tabela, de uma vez, todas as linhas enfileiradas."""
+        self._flush_timer = None
 
-            # Trunca valores muito longos
-            telefone_short = telefone[:20] if telefone else "—"
-            facebook_short = "Link FB" if facebook and facebook != "—" else "—"
+        if not self._pending_rows:
+            return
+
+        rows = list(self._pending_rows)
+        self._pending_rows.clear()
 
-            table.add_row(empresa, telefone_short, facebook_short, status)
+        try:
+            table = self.query_one("#data_table")
+            table.add_rows(rows)
         except Exception as e:
-            logger.error(f"Erro ao adicionar linha na tabela: {e}")
+            logger.error("Erro ao adicionar linhas na tabela: %s", e)
 
     def action_export(self) -> None:
         """
@@ -377,30 +428,30 @@ class ExtractMogiApp(App):
         try:
             self.update_status("📊 Gerando exportação...")
 
-            # Cria sessão do banco
-            db_session = SessionLocal()
-
-            # Cria o exportador
+            # Cria o exportador com a sessão de leitura da UI
             exporter = DataExporter(
-                db_session=db_session, model_class=ExtractMogi, export_dir="exports"
+                db_session=self.read_session,
+                model_class=ExtractMogi,
+                export_dir="exports",
             )
 
             # Exporta com filtro de URI
-            filepath = exporter.export_with_uri_filter()
-
-            # Fecha a sessão
-            db_session.close()
+            try:
+                filepath = exporter.export_with_uri_filter()
+            finally:
+                # Encerra a transação de leitura para ver dados novos na próxima
+                self.read_session.rollback()
 
             if filepath:
                 filename = os.path.basename(filepath)
                 self.update_status(f"✓ Exportação concluída: {filename}")
                 self.update_progress(f"Arquivo salvo em: {filepath}")
-                logger.info(f"Exportação realizada: {filepath}")
+                logger.info("Exportação realizada: %s", filepath)
             else:
                 self.update_status("⚠ Nenhuma empresa com URI para exportar")
 
         except Exception as e:
-            logger.error(f"Erro na exportação: {e}")
+            logger.error("Erro na exportação: %s", e)
             self.update_status(f"❌ Erro na exportação: {str(e)}")
 
     def action_clear_table(self) -> None:
@@ -408,10 +459,11 @@ class ExtractMogiApp(App):
         try:
             table = self.query_one("#data_table")
             table.clear()
+            self._pending_rows.clear()
             self.update_status("🗑 Tabela limpa")
             logger.info("Tabela de dados limpa")
         except Exception as e:
-            logger.error(f"Erro ao limpar tabela: {e}")
+            logger.error("Erro ao limpar tabela: %s", e)
 
     def update_status(self, message: str) -> None:
         """
@@ -424,7 +476,7 @@ class ExtractMogiApp(App):
             status_display = self.query_one("#status_display")
             status_display.update(message)
         except Exception as e:
-            logger.error(f"Erro ao atualizar status: {e}")
+            logger.error("Erro ao atualizar status: %s", e)
 
     def update_progress(self, message: str) -> None:
         """
@@ -437,12 +489,29 @@ class ExtractMogiApp(App):
             progress_display = self.query_one("#progress_display")
             progress_display.update(message)
         except Exception as e:
-            logger.error(f"Erro ao atualizar progresso: {e}")
+            logger.error("Erro ao atualizar progresso: %s", e)
+
+
+def _install_uvloop() -> None:
+    """Usa o uvloop como event loop quando disponível (não existe no Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop ativado como event loop")
 
 
 def main():
     """Função principal para iniciar a aplicação."""
     logger.info("Iniciando ExtractMogi")
+    _install_uvloop()
+
+    # Cria as tabelas no banco se não existirem
+    ensure_schema()
+    logger.info("Banco de dados inicializado")
+
     app = ExtractMogiApp()
     app.run()
 
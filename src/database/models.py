@@ -1,16 +1,31 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, String, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from .db_handler import Base
 
 
 class ExtractMogi(Base):
     __tablename__ = "extract_mogi"
+    __table_args__ = (
+        # Índices parciais para o filtro de URI da exportação
+        Index("ix_mogi_site", "site", sqlite_where=text("site IS NOT NULL")),
+        Index(
+            "ix_mogi_fb",
+            "facebook_link",
+            sqlite_where=text("facebook_link IS NOT NULL"),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    nome_empresa = Column(String, nullable=False)
-    telefone = Column(String, nullable=True)
-    celular_whatsapp = Column(String, nullable=True)
-    facebook_link = Column(String, nullable=True)
-    email = Column(String, nullable=True)
-    site = Column(String, nullable=True)
-    data_extracao = Column(DateTime, server_default=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    nome_empresa: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    telefone: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    celular_whatsapp: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    facebook_link: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    email: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    site: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    data_extracao: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now()
+    )
@@ -5,11 +5,33 @@ Módulo responsável pela exportação de dados para CSV.
 import csv
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterable, Sequence, Tuple
 import logging
 
+from sqlalchemy import case, func, literal, or_, select, union_all
+
 logger = logging.getLogger(__name__)
 
+# Cabeçalho do CSV exportado (ordem das colunas)
+EXPORT_HEADER = (
+    "Nome Empresa",
+    "Telefone",
+    "Celular/WhatsApp",
+    "Facebook",
+    "Email",
+    "Site",
+    "Data Extração",
+)
+
+# Formato da coluna "Data Extração"
+DATE_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+# Quantidade de linhas lidas do banco por vez durante a exportação
+BATCH_SIZE = 10_000
+
+# Tamanho do buffer de escrita do arquivo CSV (1 MiB)
+WRITE_BUFFER = 1 << 20
+
 
 class DataExporter:
     """Exporta dados do banco para CSV com filtros aplicados."""
@@ -27,8 +49,19 @@ class DataExporter:
         self.model_class = model_class
         self.export_dir = Path(export_dir)
 
-        # Cria o diretório de exportação se não existir
-        self.export_dir.mkdir(parents=True, exist_ok=True)
+        # Colunas exportadas, na ordem de EXPORT_HEADER
+        self._cols = (
+            model_class.nome_empresa,
+            model_class.telefone,
+            model_class.celular_whatsapp,
+            model_class.facebook_link,
+            model_class.email,
+            model_class.site,
+            # Data formatada pelo próprio SQLite durante a leitura
+            func.strftime(DATE_FORMAT, model_class.data_extracao).label(
+                "data_extracao_fmt"
+            ),
+        )
 
     def export_with_uri_filter(self) -> str:
         """
@@ -42,52 +75,33 @@ class DataExporter:
             Caminho do arquivo CSV gerado
         """
         try:
-            # Query com filtro: site OU facebook_link devem estar preenchidos
-            companies = (
-                self.db_session.query(self.model_class)
-                .filter(
-                    (self.model_class.site.isnot(None))
-                    | (self.model_class.facebook_link.isnot(None))
-                )
-                .all()
-            )
+            m = self.model_class
 
-            if not companies:
+            if not self._has_rows(or_(m.site.isnot(None), m.facebook_link.isnot(None))):
                 logger.warning("Nenhuma empresa com URI encontrada para exportação")
                 return None
 
-            # Gera nome do arquivo com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"extractmogi_export_{timestamp}.csv"
-            filepath = self.export_dir / filename
-
-            # Prepara dados para exportação
-            data_to_export = []
-            for company in companies:
-                data_to_export.append(
-                    {
-                        "Nome Empresa": company.nome_empresa,
-                        "Telefone": company.telefone or "",
-                        "Celular/WhatsApp": company.celular_whatsapp or "",
-                        "Facebook": company.facebook_link or "",
-                        "Email": company.email or "",
-                        "Site": company.site or "",
-                        "Data Extração": company.data_extracao.strftime(
-                            "%d/%m/%Y %H:%M:%S"
-                        ),
-                    }
-                )
-
-            # Escreve o CSV
-            self._write_csv(filepath, data_to_export)
+            # Query com filtro: site OU facebook_link devem estar preenchidos.
+            # Cada perna usa o seu índice parcial; a segunda exclui quem já
+            # tem site, dispensando o DISTINCT do UNION. Sem ORDER BY, as
+            # linhas saem em streaming: primeiro as empresas com site, depois
+            # as que têm apenas Facebook.
+            stmt = union_all(
+                select(*self._cols).where(m.site.isnot(None)),
+                select(*self._cols).where(
+                    m.facebook_link.isnot(None), m.site.is_(None)
+                ),
+            )
+
+            filepath, total = self._export_query(stmt, "extractmogi_export")
 
             logger.info(
-                f"Exportação concluída: {len(companies)} empresas exportadas para {filepath}"
+                "Exportação concluída: %s empresas exportadas para %s", total, filepath
             )
             return str(filepath)
 
         except Exception as e:
-            logger.error(f"Erro na exportação: {str(e)}")
+            logger.error("Erro na exportação: %s", e)
             raise
 
     def export_all(self) -> str:
@@ -98,46 +112,60 @@ class DataExporter:
             Caminho do arquivo CSV gerado
         """
         try:
-            companies = self.db_session.query(self.model_class).all()
-
-            if not companies:
+            if not self._has_rows():
                 logger.warning("Nenhuma empresa encontrada no banco para exportação")
                 return None
 
-            # Gera nome do arquivo com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"extractmogi_full_export_{timestamp}.csv"
-            filepath = self.export_dir / filename
-
-            # Prepara dados para exportação
-            data_to_export = []
-            for company in companies:
-                data_to_export.append(
-                    {
-                        "Nome Empresa": company.nome_empresa,
-                        "Telefone": company.telefone or "",
-                        "Celular/WhatsApp": company.celular_whatsapp or "",
-                        "Facebook": company.facebook_link or "",
-                        "Email": company.email or "",
-                        "Site": company.site or "",
-                        "Data Extração": company.data_extracao.strftime(
-                            "%d/%m/%Y %H:%M:%S"
-                        ),
-                    }
-                )
-
-            # Escreve o CSV
-            self._write_csv(filepath, data_to_export)
+            stmt = select(*self._cols)
+
+            filepath, total = self._export_query(stmt, "extractmogi_full_export")
 
             logger.info(
-                f"Exportação completa: {len(companies)} empresas exportadas para {filepath}"
+                "Exportação completa: %s empresas exportadas para %s", total, filepath
             )
             return str(filepath)
 
         except Exception as e:
-            logger.error(f"Erro na exportação: {str(e)}")
+            logger.error("Erro na exportação: %s", e)
             raise
 
+    def _has_rows(self, *criteria) -> bool:
+        """
+        Verifica com um SELECT ... LIMIT 1 se há empresas a exportar.
+
+        Args:
+            criteria: Filtros opcionais da exportação
+
+        Returns:
+            True se existe ao menos uma empresa que atende aos filtros
+        """
+        probe = (
+            select(literal(1)).select_from(self.model_class).where(*criteria).limit(1)
+        )
+        return self.db_session.execute(probe).first() is not None
+
+    def _export_query(self, stmt, prefix: str) -> Tuple[Path, int]:
+        """
+        Escreve o resultado do SELECT em CSV, lendo o banco em lotes.
+
+        Args:
+            stmt: SELECT com as colunas de self._cols
+            prefix: Prefixo do nome do arquivo
+
+        Returns:
+            Tupla (caminho do arquivo, total de linhas)
+        """
+        # Cria o diretório de exportação se não existir
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+
+        # Gera nome do arquivo com timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.export_dir / f"{prefix}_{timestamp}.csv"
+
+        result = self.db_session.execute(stmt).yield_per(BATCH_SIZE)
+        total = self._write_csv(filepath, result.partitions())
+        return filepath, total
+
     def get_export_statistics(self) -> Dict[str, int]:
         """
         Retorna estatísticas sobre os dados disponíveis para exportação.
@@ -146,33 +174,24 @@ class DataExporter:
             Dict com estatísticas
         """
         try:
-            total = self.db_session.query(self.model_class).count()
-
-            with_uri = (
-                self.db_session.query(self.model_class)
-                .filter(
-                    (self.model_class.site.isnot(None))
-                    | (self.model_class.facebook_link.isnot(None))
-                )
-                .count()
-            )
-
-            with_email = (
-                self.db_session.query(self.model_class)
-                .filter(self.model_class.email.isnot(None))
-                .count()
-            )
-
-            with_whatsapp = (
-                self.db_session.query(self.model_class)
-                .filter(self.model_class.celular_whatsapp.isnot(None))
-                .count()
+            m = self.model_class
+
+            # Uma única varredura da tabela com todas as contagens
+            stmt = select(
+                func.count(),
+                func.sum(
+                    case(
+                        (or_(m.site.isnot(None), m.facebook_link.isnot(None)), 1),
+                        else_=0,
+                    )
+                ),
+                func.sum(case((m.email.isnot(None), 1), else_=0)),
+                func.sum(case((m.celular_whatsapp.isnot(None), 1), else_=0)),
+                func.sum(case((m.telefone.isnot(None), 1), else_=0)),
             )
 
-            with_phone = (
-                self.db_session.query(self.model_class)
-                .filter(self.model_class.telefone.isnot(None))
-                .count()
+            total, with_uri, with_email, with_whatsapp, with_phone = (
+                value or 0 for value in self.db_session.execute(stmt).one()
             )
 
             return {
@@ -185,27 +204,37 @@ class DataExporter:
             }
 
         except Exception as e:
-            logger.error(f"Erro ao obter estatísticas: {str(e)}")
+            logger.error("Erro ao obter estatísticas: %s", e)
             return {}
 
     @staticmethod
-    def _write_csv(filepath: Path, data: List[Dict]):
+    def _write_csv(filepath: Path, partitions: Iterable[Sequence[Sequence]]) -> int:
         """
         Escreve dados em arquivo CSV.
+        Valores None são gravados como célula vazia pelo csv.writer.
 
         Args:
             filepath: Caminho do arquivo
-            data: Lista de dicionários com os dados
+            partitions: Lotes de linhas na ordem de EXPORT_HEADER
+
+        Returns:
+            Quantidade de linhas escritas (sem o cabeçalho)
         """
-        if not data:
-            return
+        written = 0
+
+        with open(
+            filepath, "w", newline="", encoding="utf-8-sig", buffering=WRITE_BUFFER
+        ) as csvfile:
+            writer = csv.writer(csvfile)
+
+            writer.writerow(EXPORT_HEADER)
 
-        with open(filepath, "w", newline="", encoding="utf-8-sig") as csvfile:
-            fieldnames = data[0].keys()
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            # Escreve lote a lote, como vieram do banco
+            for partition in partitions:
+                writer.writerows(partition)
+                written += len(partition)
 
-            writer.writeheader()
-            writer.writerows(data)
+        return written
 
 
 def export_data_with_uri_filter(
@@ -6,17 +6,60 @@ Inclui tratamento de CAPTCHA e delays anti-detecção.
 
 import csv
 import asyncio
+import math
 import random
 from pathlib import Path
-from typing import List, Dict, Optional, Callable, Any
+from typing import List, Dict, Optional, Callable, Any, Iterator, Set, Tuple
 from datetime import datetime
 import logging
 
+from sqlalchemy import or_
+
 from ..scrappers.google_scraper import GoogleScraper, CaptchaDetectedException
 from ..scrappers.facebook_scraper import FacebookScraper
 
 logger = logging.getLogger(__name__)
 
+# Campos que indicam que algum dado de contato foi encontrado
+DATA_FIELDS = ("telefone", "site", "facebook_link", "email", "celular_whatsapp")
+
+# Delay entre buscas no Google: log-normal com mediana de 4s, limitado a 30s
+DELAY_MU = math.log(4)
+DELAY_SIGMA = 0.5
+DELAY_MAX = 30
+
+
+def read_company_names(csv_path) -> List[str]:
+    """
+    Lê a coluna Nome_Fantasia do CSV, sem vazios e sem repetidos,
+    preservando a ordem do arquivo.
+
+    Args:
+        csv_path: Caminho para o arquivo CSV
+
+    Returns:
+        Lista com nomes das empresas
+
+    Raises:
+        ValueError: Se o CSV não tiver a coluna Nome_Fantasia
+    """
+    with open(csv_path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+
+        if "Nome_Fantasia" not in header:
+            raise ValueError("Coluna 'Nome_Fantasia' não encontrada no CSV")
+
+        idx = header.index("Nome_Fantasia")
+
+        return list(
+            dict.fromkeys(
+                nome
+                for nome in (row[idx].strip() for row in reader if len(row) > idx)
+                if nome
+            )
+        )
+
 
 class AsyncCSVProcessor:
     """
@@ -30,7 +73,10 @@ class AsyncCSVProcessor:
         db_session,
         model_class,
         headless: bool = True,
-        slow_mo: int = 2000,
+        slow_mo: int = 0,
+        concurrency: int = 3,
+        batch_size: int = 50,
+        skip_processed: bool = True,
     ):
         """
         Inicializa o processador assíncrono.
@@ -41,12 +87,19 @@ class AsyncCSVProcessor:
             model_class: Classe do modelo ExtractMogi
             headless: Se o browser deve rodar em modo headless
             slow_mo: Delay em ms entre ações do Playwright (anti-detecção)
+            concurrency: Quantidade de empresas processadas em paralelo
+            batch_size: Quantidade de empresas gravadas por commit
+            skip_processed: Se empresas já com telefone ou Facebook no banco
+                devem ser puladas (retomada após interrupção)
         """
         self.csv_path = Path(csv_path)
         self.db_session = db_session
         self.model_class = model_class
         self.headless = headless
         self.slow_mo = slow_mo
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.skip_processed = skip_processed
 
         # Callbacks para UI
         self.on_progress = None
@@ -58,6 +111,21 @@ class AsyncCSVProcessor:
         # Controle de CAPTCHA
         self.captcha_mode = False
 
+        # Controle do pipeline (inicializado em process_all)
+        self._results = None
+        self._completed = 0
+        self._page_pool = None
+        self._db_lock = None
+
+        # Registros aguardando gravação em lote, por nome da empresa
+        self._pending: Dict[str, Dict] = {}
+
+        # Empresas já gravadas no banco: nome -> id (carregado em process_all)
+        self._known: Dict[str, int] = {}
+
+        # Empresas que já têm telefone ou Facebook no banco
+        self._done: Set[str] = set()
+
         if not self.csv_path.exists():
             raise FileNotFoundError(f"CSV não encontrado: {csv_path}")
 
@@ -92,21 +160,13 @@ class AsyncCSVProcessor:
         Returns:
             Lista com nomes das empresas
         """
-        companies = []
-
         try:
-            with open(self.csv_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-
-                for row in reader:
-                    nome = row.get("Nome_Fantasia", "").strip()
-                    if nome:
-                        companies.append(nome)
+            companies = read_company_names(self.csv_path)
 
-            logger.info(f"CSV lido com sucesso: {len(companies)} empresas encontradas")
+            logger.info("CSV lido com sucesso: %s empresas encontradas", len(companies))
 
         except Exception as e:
-            logger.error(f"Erro ao ler CSV: {str(e)}")
+            logger.error("Erro ao ler CSV: %s", e)
             raise
 
         return companies
@@ -121,7 +181,7 @@ class AsyncCSVProcessor:
         companies = self.read_csv()
         total = len(companies)
 
-        logger.info(f"Iniciando processamento assíncrono de {total} empresas")
+        logger.info("Iniciando processamento assíncrono de %s empresas", total)
 
         stats = {
             "total": total,
@@ -130,94 +190,198 @@ class AsyncCSVProcessor:
             "sem_dados": 0,
             "erros": 0,
             "captchas": 0,
+            "ignoradas": 0,
         }
 
-        async with GoogleScraper(
-            headless=self.headless, slow_mo=self.slow_mo
-        ) as google_scraper:
+        # Acesso ao banco sempre fora do event loop, uma operação por vez
+        self._db_lock = asyncio.Lock()
+        await asyncio.to_thread(self._load_known)
 
-            # Define callback de CAPTCHA no scraper
-            google_scraper.set_captcha_callback(self._on_captcha_callback)
+        try:
+            async with GoogleScraper(
+                headless=self.headless, slow_mo=self.slow_mo
+            ) as google_scraper:
+
+                # Define callback de CAPTCHA no scraper
+                google_scraper.set_captcha_callback(self._on_captcha_callback)
+
+                # Pipeline: `concurrency` buscas no Google alimentam, por uma fila
+                # limitada, os workers que visitam o Facebook e gravam no banco
+                self._completed = 0
+                self._results = asyncio.Queue(maxsize=self.concurrency)
+                pending = iter(enumerate(companies, 1))
+
+                # Páginas reutilizadas nas visitas ao Facebook (uma por worker)
+                self._page_pool = asyncio.Queue()
+                for _ in range(self.concurrency):
+                    self._page_pool.put_nowait(await google_scraper.context.new_page())
+
+                producers = [
+                    asyncio.create_task(
+                        self._google_worker(google_scraper, pending, stats)
+                    )
+                    for _ in range(self.concurrency)
+                ]
+                consumers = [
+                    asyncio.create_task(self._facebook_worker(stats))
+                    for _ in range(self.concurrency)
+                ]
 
-            for idx, nome_empresa in enumerate(companies, 1):
                 try:
-                    # Notifica início do processamento
-                    if self.on_company_start:
-                        await self.on_company_start(nome_empresa)
+                    await asyncio.gather(*producers)
+
+                    # Sinaliza o fim da fila para cada worker do Facebook
+                    for _ in consumers:
+                        await self._results.put(None)
+                    await asyncio.gather(*consumers)
+                finally:
+                    for task in producers + consumers:
+                        task.cancel()
+
+                    # Grava o que restou no último lote
+                    async with self._db_lock:
+                        await asyncio.to_thread(self.flush)
+        finally:
+            # Encerra o browser compartilhado junto com este event loop
+            await GoogleScraper.shutdown()
 
-                    # Atualiza progresso
-                    if self.on_progress:
-                        percentage = int((idx / total) * 100)
-                        await self.on_progress(idx, total, percentage)
+        logger.info("Processamento concluído: %s", stats)
+        return stats
 
-                    logger.info(f"[{idx}/{total}] Processando: {nome_empresa}")
+    async def _google_worker(
+        self,
+        google_scraper: GoogleScraper,
+        pending: Iterator[Tuple[int, str]],
+        stats: Dict[str, int],
+    ):
+        """
+        Busca empresas no Google e enfileira os resultados para o Facebook.
+        Enquanto o Facebook de uma empresa é visitado, a próxima busca já roda.
 
-                    # Processa a empresa
-                    company_data = await self._process_company(
-                        google_scraper, nome_empresa
-                    )
+        Args:
+            google_scraper: Instância do GoogleScraper
+            pending: Iterador compartilhado de (posição no CSV, nome da empresa)
+            stats: Estatísticas do processamento (atualizadas no lugar)
+        """
+        total = stats["total"]
+
+        for idx, nome_empresa in pending:
+            # Já processada em uma execução anterior (o banco é o checkpoint)
+            if nome_empresa in self._done:
+                stats["processadas"] += 1
+                stats["ignoradas"] += 1
+                await self._advance_progress(total)
+                continue
 
-                    # Salva no banco
-                    self._save_to_database(company_data)
-
-                    # Atualiza estatísticas
-                    stats["processadas"] += 1
-
-                    # Verifica se encontrou algum dado
-                    has_data = any(
-                        [
-                            company_data["telefone"],
-                            company_data["site"],
-                            company_data["facebook_link"],
-                            company_data["email"],
-                            company_data["celular_whatsapp"],
-                        ]
+            try:
+                # Notifica início do processamento
+                if self.on_company_start:
+                    await self.on_company_start(nome_empresa)
+
+                logger.info("[%s/%s] Processando: %s", idx, total, nome_empresa)
+
+                # Busca dados no Google
+                google_data = await google_scraper.search_company(nome_empresa)
+                await self._results.put((nome_empresa, google_data))
+
+            except CaptchaDetectedException as e:
+                error_msg = str(e)
+                logger.error("CAPTCHA detectado para %s: %s", nome_empresa, error_msg)
+                stats["captchas"] += 1
+
+                # Notifica erro de CAPTCHA
+                if self.on_error:
+                    await self.on_error(nome_empresa, f"CAPTCHA: {error_msg}")
+
+                # Se estiver em headless, sugere modo visual
+                if self.headless:
+                    logger.warning(
+                        "DICA: Execute novamente com headless=False para "
+                        "resolver CAPTCHAs manualmente"
                     )
 
-                    if has_data:
-                        stats["com_dados"] += 1
-                    else:
-                        stats["sem_dados"] += 1
-
-                    # Notifica conclusão
-                    if self.on_company_complete:
-                        await self.on_company_complete(nome_empresa, company_data)
-
-                    # DELAY ALEATÓRIO entre empresas (evita CAPTCHA)
-                    delay = random.uniform(3, 7)
-                    logger.debug(f"Aguardando {delay:.2f}s antes da próxima empresa...")
-                    await asyncio.sleep(delay)
-
-                except CaptchaDetectedException as e:
-                    error_msg = str(e)
-                    logger.error(f"CAPTCHA detectado para {nome_empresa}: {error_msg}")
-                    stats["captchas"] += 1
-
-                    # Notifica erro de CAPTCHA
-                    if self.on_error:
-                        await self.on_error(nome_empresa, f"CAPTCHA: {error_msg}")
-
-                    # Se estiver em headless, sugere modo visual
-                    if self.headless:
-                        logger.warning(
-                            "DICA: Execute novamente com headless=False para "
-                            "resolver CAPTCHAs manualmente"
-                        )
-                        # Pode optar por parar ou continuar
-                        # Por padrão, vamos continuar com as próximas empresas
-                        continue
-
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(f"Erro ao processar {nome_empresa}: {error_msg}")
-                    stats["erros"] += 1
-
-                    # Notifica erro
-                    if self.on_error:
-                        await self.on_error(nome_empresa, error_msg)
-
-        logger.info(f"Processamento concluído: {stats}")
-        return stats
+                await self._advance_progress(total)
+
+            except Exception as e:
+                error_msg = str(e)
+                logger.error("Erro ao processar %s: %s", nome_empresa, error_msg)
+                stats["erros"] += 1
+
+                # Notifica erro
+                if self.on_error:
+                    await self.on_error(nome_empresa, error_msg)
+
+                await self._advance_progress(total)
+
+            # DELAY ALEATÓRIO entre buscas (evita CAPTCHA): log-normal, concentrado
+            # na mediana com pausas longas ocasionais
+            delay = min(DELAY_MAX, random.lognormvariate(DELAY_MU, DELAY_SIGMA))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Aguardando %.2fs antes da próxima empresa...", delay)
+            await asyncio.sleep(delay)
+
+    async def _facebook_worker(self, stats: Dict[str, int]):
+        """
+        Consome os resultados do Google: visita o Facebook e grava no banco.
+        Encerra ao receber None da fila.
+
+        Args:
+            stats: Estatísticas do processamento (atualizadas no lugar)
+        """
+        total = stats["total"]
+
+        while True:
+            item = await self._results.get()
+            if item is None:
+                return
+
+            nome_empresa, google_data = item
+
+            try:
+                # Completa os dados com o Facebook
+                company_data = await self._process_company(nome_empresa, google_data)
+
+                # Salva no banco em uma thread, sem bloquear os demais scrapers
+                async with self._db_lock:
+                    await asyncio.to_thread(self._save_to_database, company_data)
+
+                # Atualiza estatísticas
+                stats["processadas"] += 1
+
+                # Verifica se encontrou algum dado
+                has_data = any(company_data[k] for k in DATA_FIELDS)
+
+                if has_data:
+                    stats["com_dados"] += 1
+                else:
+                    stats["sem_dados"] += 1
+
+                # Notifica conclusão
+                if self.on_company_complete:
+                    await self.on_company_complete(nome_empresa, company_data)
+
+            except Exception as e:
+                error_msg = str(e)
+                logger.error("Erro ao processar %s: %s", nome_empresa, error_msg)
+                stats["erros"] += 1
+
+                # Notifica erro
+                if self.on_error:
+                    await self.on_error(nome_empresa, error_msg)
+
+            await self._advance_progress(total)
+
+    async def _advance_progress(self, total: int):
+        """
+        Conta mais uma empresa concluída e notifica o progresso.
+
+        Args:
+            total: Total de empresas do CSV
+        """
+        self._completed += 1
+        if self.on_progress:
+            percentage = int((self._completed / total) * 100)
+            await self.on_progress(self._completed, total, percentage)
 
     async def _on_captcha_callback(self, nome_empresa: str):
         """
@@ -226,7 +390,7 @@ class AsyncCSVProcessor:
         Args:
             nome_empresa: Nome da empresa
         """
-        logger.warning(f"CAPTCHA detectado para: {nome_empresa}")
+        logger.warning("CAPTCHA detectado para: %s", nome_empresa)
 
         if self.on_captcha_detected:
             await self.on_captcha_detected(
@@ -234,21 +398,18 @@ class AsyncCSVProcessor:
             )
 
     async def _process_company(
-        self, google_scraper: GoogleScraper, nome_empresa: str
+        self, nome_empresa: str, google_data: Dict[str, Optional[str]]
     ) -> Dict[str, Optional[str]]:
         """
-        Processa uma única empresa.
+        Completa os dados de uma empresa já buscada no Google.
 
         Args:
-            google_scraper: Instância do GoogleScraper
             nome_empresa: Nome da empresa
+            google_data: Dados retornados pela busca no Google
 
         Returns:
             Dict com todos os dados extraídos
         """
-        # Busca dados no Google
-        google_data = await google_scraper.search_company(nome_empresa)
-
         # Dados completos
         company_data = {
             "nome_empresa": nome_empresa,
@@ -263,28 +424,27 @@ class AsyncCSVProcessor:
         if google_data.get("facebook_link"):
             try:
                 facebook_data = await self._extract_facebook_data(
-                    google_scraper.context, google_data["facebook_link"]
+                    google_data["facebook_link"]
                 )
                 company_data.update(facebook_data)
             except Exception as e:
-                logger.error(f"Erro ao extrair dados do Facebook: {e}")
+                logger.error("Erro ao extrair dados do Facebook: %s", e)
 
         return company_data
 
     async def _extract_facebook_data(
-        self, context, facebook_url: str
+        self, facebook_url: str
     ) -> Dict[str, Optional[str]]:
         """
-        Extrai dados do Facebook.
+        Extrai dados do Facebook usando uma página do pool.
 
         Args:
-            context: Contexto do browser do Playwright
             facebook_url: URL da página do Facebook
 
         Returns:
             Dict com email e celular_whatsapp
         """
-        page = await context.new_page()
+        page = await self._page_pool.get()
 
         try:
             facebook_data = await FacebookScraper.extract_contact_info(
@@ -292,38 +452,94 @@ class AsyncCSVProcessor:
             )
             return facebook_data
         finally:
-            await page.close()
+            self._page_pool.put_nowait(page)
+
+    def _load_known(self):
+        """
+        Carrega, em uma única consulta, os nomes já gravados no banco
+        e quais deles já têm telefone ou Facebook.
+        """
+        model = self.model_class
+        self._known = {}
+        self._done = set()
+
+        for id_, nome, found in self.db_session.query(
+            model.id,
+            model.nome_empresa,
+            or_(model.telefone.isnot(None), model.facebook_link.isnot(None)),
+        ):
+            self._known.setdefault(nome, id_)
+            if found and self.skip_processed:
+                self._done.add(nome)
+
+        if self._done:
+            logger.info("%s empresas já processadas serão puladas", len(self._done))
 
     def _save_to_database(self, data: Dict):
         """
-        Salva dados no banco de dados.
+        Enfileira os dados da empresa para gravação em lote.
+        O lote é gravado quando atinge batch_size registros ou em flush().
 
         Args:
             data: Dados da empresa para salvar
         """
-        try:
-            # Verifica se a empresa já existe
-            existing = (
-                self.db_session.query(self.model_class)
-                .filter_by(nome_empresa=data["nome_empresa"])
-                .first()
-            )
+        pending = self._pending.get(data["nome_empresa"])
+
+        if pending is None:
+            self._pending[data["nome_empresa"]] = dict(data)
+        else:
+            # Mesma empresa repetida no lote: mantém os valores já encontrados
+            pending.update((k, v) for k, v in data.items() if v is not None)
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
 
-            if existing:
-                # Atualiza registro existente
-                for key, value in data.items():
-                    if key != "nome_empresa" and value is not None:
-                        setattr(existing, key, value)
-                logger.info(f"Registro atualizado: {data['nome_empresa']}")
-            else:
-                # Cria novo registro
-                new_record = self.model_class(**data)
-                self.db_session.add(new_record)
-                logger.info(f"Novo registro criado: {data['nome_empresa']}")
+    def flush(self):
+        """Grava no banco, em uma única transação, os registros pendentes."""
+        if not self._pending:
+            return
+
+        try:
+            inserts = []
+            updates = []
+
+            # Insert ou update decidido pelo cache em memória, sem consultar o banco
+            for data in self._pending.values():
+                id_ = self._known.get(data["nome_empresa"])
+                if id_ is None:
+                    # Cópia: return_defaults grava o id no próprio dicionário
+                    inserts.append(dict(data))
+                else:
+                    # Atualiza apenas os campos encontrados nesta execução
+                    update = {
+                        k: v
+                        for k, v in data.items()
+                        if k != "nome_empresa" and v is not None
+                    }
+                    update["id"] = id_
+                    updates.append(update)
+
+            if inserts:
+                # return_defaults preenche o id de cada registro inserido
+                self.db_session.bulk_insert_mappings(
+                    self.model_class, inserts, return_defaults=True
+                )
+            if updates:
+                self.db_session.bulk_update_mappings(self.model_class, updates)
 
             self.db_session.commit()
 
+            # Só descarta o lote depois do commit; se falhar, os registros
+            # continuam pendentes para a próxima tentativa
+            self._pending.clear()
+            for data in inserts:
+                self._known[data["nome_empresa"]] = data["id"]
+
+            logger.info(
+                "Lote salvo: %s novos, %s atualizados", len(inserts), len(updates)
+            )
+
         except Exception as e:
-            logger.error(f"Erro ao salvar no banco: {str(e)}")
+            logger.error("Erro ao salvar no banco: %s", e)
             self.db_session.rollback()
             raise
@@ -2,18 +2,21 @@
 Módulo responsável pelo processamento do CSV e coordenação da extração.
 """
 
-import csv
 import asyncio
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
 from datetime import datetime
 import logging
 
+from src.processors.async_processor import read_company_names
 from src.scrappers.google_scraper import GoogleScraper
 from src.scrappers.facebook_scraper import FacebookScraper
 
 logger = logging.getLogger(__name__)
 
+# Campos que indicam que algum dado de contato foi encontrado
+DATA_FIELDS = ("telefone", "site", "facebook_link", "email", "celular_whatsapp")
+
 
 class CSVProcessor:
     """Processa o CSV e coordena a extração de dados."""
@@ -55,7 +58,7 @@ class CSVProcessor:
         companies = self._read_csv()
         total = len(companies)
 
-        logger.info(f"Iniciando processamento de {total} empresas")
+        logger.info("Iniciando processamento de %s empresas", total)
 
         stats = {
             "total": total,
@@ -72,7 +75,7 @@ class CSVProcessor:
                     if self.progress_callback:
                         self.progress_callback(idx, total, nome_empresa)
 
-                    logger.info(f"[{idx}/{total}] Processando: {nome_empresa}")
+                    logger.info("[%s/%s] Processando: %s", idx, total, nome_empresa)
 
                     # Busca dados no Google
                     google_data = await google_scraper.search_company(nome_empresa)
@@ -101,15 +104,7 @@ class CSVProcessor:
                     stats["processadas"] += 1
 
                     # Verifica se encontrou algum dado
-                    has_data = any(
-                        [
-                            company_data["telefone"],
-                            company_data["site"],
-                            company_data["facebook_link"],
-                            company_data["email"],
-                            company_data["celular_whatsapp"],
-                        ]
-                    )
+                    has_data = any(company_data[k] for k in DATA_FIELDS)
 
                     if has_data:
                         stats["com_dados"] += 1
@@ -120,10 +115,10 @@ class CSVProcessor:
                     await asyncio.sleep(1)
 
                 except Exception as e:
-                    logger.error(f"Erro ao processar {nome_empresa}: {str(e)}")
+                    logger.error("Erro ao processar %s: %s", nome_empresa, e)
                     stats["erros"] += 1
 
-        logger.info(f"Processamento concluído: {stats}")
+        logger.info("Processamento concluído: %s", stats)
         return stats
 
     def _read_csv(self) -> List[str]:
@@ -133,21 +128,13 @@ class CSVProcessor:
         Returns:
             Lista com nomes das empresas
         """
-        companies = []
-
         try:
-            with open(self.csv_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
+            companies = read_company_names(self.csv_path)
 
-                for row in reader:
-                    nome = row.get("Nome_Fantasia", "").strip()
-                    if nome:
-                        companies.append(nome)
-
-            logger.info(f"CSV lido com sucesso: {len(companies)} empresas encontradas")
+            logger.info("CSV lido com sucesso: %s empresas encontradas", len(companies))
 
         except Exception as e:
-            logger.error(f"Erro ao ler CSV: {str(e)}")
+            logger.error("Erro ao ler CSV: %s", e)
             raise
 
         return companies
@@ -183,29 +170,31 @@ class CSVProcessor:
             data: Dados da empresa para salvar
         """
         try:
-            # Verifica se a empresa já existe
-            existing = (
-                self.db_session.query(self.model_class)
-                .filter_by(nome_empresa=data["nome_empresa"])
-                .first()
+            query = self.db_session.query(self.model_class).filter_by(
+                nome_empresa=data["nome_empresa"]
             )
+            values = {
+                k: v for k, v in data.items() if k != "nome_empresa" and v is not None
+            }
+
+            # Atualiza direto com um UPDATE, sem carregar o registro na sessão
+            if values:
+                exists = query.update(values, synchronize_session=False) > 0
+            else:
+                exists = self.db_session.query(query.exists()).scalar()
 
-            if existing:
-                # Atualiza registro existente
-                for key, value in data.items():
-                    if key != "nome_empresa" and value is not None:
-                        setattr(existing, key, value)
-                logger.info(f"Registro atualizado: {data['nome_empresa']}")
+            if exists:
+                logger.info("Registro atualizado: %s", data["nome_empresa"])
             else:
                 # Cria novo registro
                 new_record = self.model_class(**data)
                 self.db_session.add(new_record)
-                logger.info(f"Novo registro criado: {data['nome_empresa']}")
+                logger.info("Novo registro criado: %s", data["nome_empresa"])
 
             self.db_session.commit()
 
         except Exception as e:
-            logger.error(f"Erro ao salvar no banco: {str(e)}")
+            logger.error("Erro ao salvar no banco: %s", e)
             self.db_session.rollback()
             raise
 
@@ -238,5 +227,12 @@ def run_extraction(
         headless=headless,
     )
 
+    async def _run() -> Dict[str, int]:
+        try:
+            return await processor.process()
+        finally:
+            # Encerra o browser compartilhado antes de o event loop terminar
+            await GoogleScraper.shutdown()
+
     # Executa o processamento assíncrono
-    return asyncio.run(processor.process())
+    return asyncio.run(_run())
@@ -3,13 +3,76 @@ Módulo responsável pela extração de dados do Facebook.
 """
 
 import re
-import asyncio
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Padrão de email
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+
+# Emails comuns de redes sociais que não são da empresa
+_EXCLUDED_DOMAINS = frozenset(
+    {
+        "facebook.com",
+        "instagram.com",
+        "twitter.com",
+        "google.com",
+        "outlook.com",
+        "example.com",
+    }
+)
+
+# Telefone/WhatsApp com DDD 19, em uma única alternação:
+# (19) 9 1234-5678 | 19 9 1234-5678 | +55 19 9 1234-5678 | 55 19 9 1234-5678
+_PHONE_RE = re.compile(r"(?:\+?55\s*)?\(?19\)?\s*9\s*\d{4}[-\s]?\d{4}")
+
+# Número de 9 dígitos após um contexto de WhatsApp. O número precisa
+# começar no 9 (e não no meio de outro número, como em "19 3862-1234")
+_WHATSAPP_CONTEXT_RE = re.compile(
+    r"(whatsapp|celular|contato|telefone)[\s\S]{0,50}?"
+    r"(?<!\d)(?P<number>9\s*\d{4}[-\s]?\d{4})(?!\d)",
+    re.IGNORECASE,
+)
+
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
+# Email e telefone em um único padrão, distinguidos pelo grupo nomeado
+_CONTACT_RE = re.compile(
+    f"(?P<email>{_EMAIL_RE.pattern})|(?P<phone>{_PHONE_RE.pattern})"
+)
+
+# Resultado sem contato, copiado a cada extração (caminho comum de falha)
+_EMPTY_CONTACT = {"email": None, "celular_whatsapp": None}
+
+# Seletor do conteúdo principal, aguardado no lugar de pausas fixas
+MAIN_SELECTOR = '[data-testid="about_page"], div[role="main"]'
+MAIN_TIMEOUT = 5000
+
+# URL da seção "Sobre" (/about, /about_contact_and_basic_info, ?sk=about)
+ABOUT_URL_RE = re.compile(r"[/=]about", re.IGNORECASE)
+
+# Links para a seção "Sobre"/"About" da página, em ordem de prioridade:
+# primeiro pelo href, depois pelo texto do link
+ABOUT_HREF = "/about"
+ABOUT_TEXTS = ("sobre", "about", "informações", "info")
+ABOUT_MARK = "data-extractmogi-about"
+ABOUT_TIMEOUT = 3000
+
+# Marca o primeiro link encontrado, respeitando a prioridade acima
+_JS_FIND_ABOUT = """([href, texts, mark]) => {
+    const links = Array.from(document.querySelectorAll('a'));
+    let found = links.find(a => (a.getAttribute('href') || '').includes(href));
+    for (const text of texts) {
+        if (found) break;
+        found = links.find(a => (a.innerText || '').toLowerCase().includes(text));
+    }
+    if (!found) return false;
+    found.setAttribute(mark, '');
+    return true;
+}"""
+
 
 class FacebookScraper:
     """Scraper para extrair informações de contato do Facebook."""
@@ -28,29 +91,25 @@ class FacebookScraper:
         Returns:
             Dict com email e celular_whatsapp
         """
-        result = {"email": None, "celular_whatsapp": None}
+        result = _EMPTY_CONTACT.copy()
 
         try:
             logger.info(f"Acessando Facebook: {facebook_url}")
 
             # Acessa a página do Facebook
             await page.goto(facebook_url, wait_until="domcontentloaded")
-            await asyncio.sleep(2)  # Aguarda carregamento dinâmico
+            await FacebookScraper._wait_for_main(page)  # Carregamento dinâmico
 
             # Tenta navegar para a seção "Sobre" ou "About"
             await FacebookScraper._navigate_to_about(page)
 
-            # Aguarda o carregamento da página
-            await asyncio.sleep(2)
-
-            # Extrai o conteúdo da página
-            content = await page.content()
-
-            # Extrai email
-            result["email"] = FacebookScraper._extract_email(content)
+            # Extrai apenas o texto visível (sem scripts, JSON e CSS do HTML)
+            content = await page.inner_text("body")
 
-            # Extrai WhatsApp/Celular
-            result["celular_whatsapp"] = FacebookScraper._extract_whatsapp(content)
+            # Extrai email e WhatsApp/Celular em uma única varredura
+            result["email"], result["celular_whatsapp"] = (
+                FacebookScraper._extract_contacts(content)
+            )
 
             logger.info(f"Dados do Facebook extraídos: {result}")
 
@@ -61,114 +120,142 @@ class FacebookScraper:
 
         return result
 
+    @staticmethod
+    async def _wait_for_main(page: Page):
+        """
+        Aguarda o conteúdo principal da página ser renderizado.
+        Segue em frente após MAIN_TIMEOUT ms, mesmo sem o seletor.
+        """
+        try:
+            await page.wait_for_selector(MAIN_SELECTOR, timeout=MAIN_TIMEOUT)
+        except PlaywrightTimeout:
+            logger.debug("Conteúdo principal não detectado a tempo")
+
     @staticmethod
     async def _navigate_to_about(page: Page):
         """Tenta navegar para a seção Sobre/About da página."""
         try:
-            # Tenta clicar no link "Sobre" ou "About"
-            about_selectors = [
-                'a[href*="/about"]',
-                'a:has-text("Sobre")',
-                'a:has-text("About")',
-                'a:has-text("Informações")',
-                'a:has-text("Info")',
-            ]
-
-            for selector in about_selectors:
-                try:
-                    about_link = await page.query_selector(selector)
-                    if about_link:
-                        await about_link.click()
-                        await page.wait_for_load_state("domcontentloaded")
-                        logger.info("Navegou para seção Sobre")
-                        return
-                except:
-                    continue
-
+            # Um único evaluate percorre os candidatos em ordem de prioridade;
+            # só clica quando algum link existe, sem esperar por seletores
+            found = await page.evaluate(
+                _JS_FIND_ABOUT, [ABOUT_HREF, list(ABOUT_TEXTS), ABOUT_MARK]
+            )
+            if not found:
+                logger.debug("Link para seção Sobre não encontrado")
+                return
+
+            await page.click(f"a[{ABOUT_MARK}]", timeout=ABOUT_TIMEOUT)
+        except PlaywrightTimeout:
+            logger.debug("Link para seção Sobre não respondeu ao clique")
+            return
         except Exception as e:
             logger.debug(f"Não foi possível navegar para seção Sobre: {str(e)}")
+            return
+
+        # div[role="main"] já existe desde a página inicial; o sinal de que
+        # a seção Sobre carregou é a própria URL
+        try:
+            await page.wait_for_url(
+                ABOUT_URL_RE, wait_until="domcontentloaded", timeout=MAIN_TIMEOUT
+            )
+            logger.info("Navegou para seção Sobre")
+
+        except PlaywrightTimeout:
+            logger.debug("Seção Sobre não carregou a tempo")
 
     @staticmethod
-    def _extract_email(content: str) -> Optional[str]:
+    def _extract_contacts(content: str) -> Tuple[Optional[str], Optional[str]]:
         """
-        Extrai email do conteúdo HTML.
+        Extrai email e WhatsApp/Celular do texto da página.
+        Percorre o conteúdo uma única vez e para no primeiro par válido.
 
         Args:
-            content: HTML da página
+            content: Texto da página
 
         Returns:
-            Email encontrado ou None
+            Tupla (email, celular_whatsapp), com None no que não for encontrado
         """
-        # Padrão de email
-        email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-
-        # Remove emails comuns de redes sociais que não são da empresa
-        excluded_domains = [
-            "facebook.com",
-            "instagram.com",
-            "twitter.com",
-            "google.com",
-            "outlook.com",
-            "example.com",
-        ]
-
-        emails = re.findall(email_pattern, content)
-
-        for email in emails:
-            # Verifica se não é de domínio excluído
-            if not any(domain in email.lower() for domain in excluded_domains):
-                logger.info(f"Email encontrado: {email}")
-                return email.lower()
+        email = None
+        whatsapp = None
 
-        return None
+        for match in _CONTACT_RE.finditer(content):
+            if match.lastgroup == "email":
+                if email is None:
+                    email = FacebookScraper._check_email(match.group())
+            elif whatsapp is None:
+                whatsapp = FacebookScraper._check_whatsapp(match.group())
+
+            if email and whatsapp:
+                break
+
+        # Tenta padrão mais genérico de 9 dígitos após contexto de WhatsApp
+        if whatsapp is None:
+            whatsapp = FacebookScraper._extract_whatsapp_context(content)
+
+        return email, whatsapp
 
     @staticmethod
-    def _extract_whatsapp(content: str) -> Optional[str]:
+    def _check_email(email: str) -> Optional[str]:
         """
-        Extrai número de WhatsApp/Celular do conteúdo HTML.
-        Procura por números com DDD 19 (Mogi Mirim) e 9 dígitos.
+        Valida um email encontrado no conteúdo.
 
         Args:
-            content: HTML da página
+            email: Email encontrado
+
+        Returns:
+            Email em minúsculas ou None se for de domínio excluído
+        """
+        email = email.lower()
+
+        # Verifica se não é de domínio excluído, incluindo subdomínios
+        # (ex.: business.facebook.com): cada sufixo é consultado no frozenset
+        parts = email.rsplit("@", 1)[-1].split(".")
+        if any(".".join(parts[i:]) in _EXCLUDED_DOMAINS for i in range(len(parts) - 1)):
+            return None
+
+        logger.info(f"Email encontrado: {email}")
+        return email
+
+    @staticmethod
+    def _check_whatsapp(phone: str) -> Optional[str]:
+        """
+        Valida um número com DDD 19 (Mogi Mirim) e 9 dígitos.
+
+        Args:
+            phone: Número encontrado no conteúdo
 
         Returns:
             Número formatado ou None
         """
-        # Padrões de telefone/WhatsApp com DDD 19
-        phone_patterns = [
-            r"\(19\)\s*9\s*\d{4}[-\s]?\d{4}",  # (19) 9 1234-5678
-            r"19\s*9\s*\d{4}[-\s]?\d{4}",  # 19 9 1234-5678
-            r"\+55\s*19\s*9\s*\d{4}[-\s]?\d{4}",  # +55 19 9 1234-5678
-            r"55\s*19\s*9\s*\d{4}[-\s]?\d{4}",  # 55 19 9 1234-5678
-        ]
-
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, content)
-            if matches:
-                # Pega o primeiro match e limpa
-                phone = re.sub(r"[^\d]", "", matches[0])
-
-                # Verifica se é um celular válido (DDD 19 + 9 dígitos)
-                if len(phone) >= 11 and phone[-11:-9] == "19" and phone[-10] == "9":
-                    formatted = FacebookScraper._format_whatsapp(phone[-11:])
-                    logger.info(f"WhatsApp encontrado: {formatted}")
-                    return formatted
-
-        # Tenta padrão mais genérico de 9 dígitos após encontrar contexto de WhatsApp
-        whatsapp_context = (
-            r"(?i)(whatsapp|celular|contato|telefone)[\s\S]{0,50}9\s*\d{4}[-\s]?\d{4}"
-        )
-        context_matches = re.findall(whatsapp_context, content)
-
-        if context_matches:
-            # Extrai apenas o número
-            number_match = re.search(r"9\s*\d{4}[-\s]?\d{4}", context_matches[0])
-            if number_match:
-                phone = re.sub(r"[^\d]", "", number_match.group())
-                if len(phone) == 9:
-                    formatted = f"(19) {FacebookScraper._format_whatsapp(f'19{phone}')}"
-                    logger.info(f"WhatsApp encontrado (contexto): {formatted}")
-                    return formatted
+        phone = _NON_DIGIT_RE.sub("", phone)
+
+        # Verifica se é um celular válido (DDD 19 + 9 dígitos)
+        if len(phone) >= 11 and phone[-11:-9] == "19" and phone[-10] == "9":
+            formatted = FacebookScraper._format_whatsapp(phone[-11:])
+            logger.info(f"WhatsApp encontrado: {formatted}")
+            return formatted
+
+        return None
+
+    @staticmethod
+    def _extract_whatsapp_context(content: str) -> Optional[str]:
+        """
+        Procura um número de 9 dígitos logo após palavras como "WhatsApp".
+
+        Args:
+            content: Texto da página
+
+        Returns:
+            Número formatado com DDD 19 ou None
+        """
+        context_match = _WHATSAPP_CONTEXT_RE.search(content)
+
+        if context_match:
+            # Usa apenas o número capturado
+            phone = _NON_DIGIT_RE.sub("", context_match.group("number"))
+            formatted = FacebookScraper._format_whatsapp(f"19{phone}")
+            logger.info(f"WhatsApp encontrado (contexto): {formatted}")
+            return formatted
 
         return None
 
@@ -184,7 +271,7 @@ class FacebookScraper:
             Número formatado
         """
         # Remove tudo que não é número
-        phone = re.sub(r"[^\d]", "", phone)
+        phone = _NON_DIGIT_RE.sub("", phone)
 
         # Formato: (19) 99999-9999
         if len(phone) >= 11:
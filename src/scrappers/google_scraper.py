@@ -6,17 +6,193 @@ Inclui detecção e resolução de CAPTCHA com intervenção humana.
 import re
 import asyncio
 import random
-from urllib.parse import urlparse, parse_qs
-from typing import Optional, Dict, Callable
+from urllib.parse import urlencode
+from typing import Optional, Dict, Callable, List, Union
 from playwright.async_api import (
     async_playwright,
+    Browser,
     Page,
+    Response,
+    Route,
     TimeoutError as PlaywrightTimeout,
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Perfis de navegador realistas (Chrome com interface no Windows);
+# cada contexto sorteia um, com user agent e client hints coerentes entre si.
+# Só Windows: navigator.platform e userAgentData continuam reportando o
+# sistema real, e um UA de outro sistema seria uma divergência detectável
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{}.0.0.0 Safari/537.36"
+_PLATFORM = '"Windows"'
+
+_SEC_CH_UA = {
+    "119": '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
+    "120": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    "121": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+}
+
+_FINGERPRINTS = (
+    ("119", (1920, 1080), "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7"),
+    ("120", (1536, 864), "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7"),
+    ("121", (1366, 768), "pt-BR,pt;q=0.9"),
+    ("120", (1920, 1080), "pt-BR,pt;q=0.9,en;q=0.8"),
+    ("121", (1440, 900), "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7"),
+    ("119", (1680, 1050), "pt-BR,pt;q=0.9,en;q=0.8"),
+)
+
+# Espera (ms) pelo painel da empresa antes de recorrer à rolagem
+PANEL_TIMEOUT = 3000
+
+# Pausa (s) após cada rolagem da página de resultados
+SCROLL_PAUSE = (0.2, 0.5)
+
+# Tipos de recurso que nenhum scraper lê (abortados no contexto)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+SEARCH_URL = "https://www.google.com/search?"
+
+# Resultados da busca (painel da empresa ou lista) ou a página de CAPTCHA
+RESULTS_SELECTOR = ", ".join(
+    (
+        "div#search",
+        '[data-attrid="kc:/local:all in one"]',
+        "form#captcha-form",
+        "div.g-recaptcha",
+    )
+)
+RESULTS_TIMEOUT = 8000
+
+# Tentativas por busca em falhas transitórias, com backoff de 0.3s, 0.6s, ...
+SEARCH_ATTEMPTS = 3
+RETRY_BACKOFF = 0.3
+
+# Status HTTP da página de bloqueio do Google
+CAPTCHA_STATUS = frozenset({403, 429, 503})
+
+# Seletores que indicam a página de CAPTCHA
+_CAPTCHA_SELECTORS = (
+    "form#captcha-form",
+    "#captcha-form",
+    "div.g-recaptcha",
+    'iframe[src*="recaptcha"]',
+)
+
+# Textos da página de bloqueio do Google, em uma única alternação
+# (avaliada no navegador sem diferenciar maiúsculas)
+_CAPTCHA_PATTERN = "|".join(
+    re.escape(text)
+    for text in (
+        "unusual traffic",
+        "tráfego incomum",
+        "sistemas automatizados",
+        "automated queries",
+    )
+)
+
+# Padrões de telefone, do mais específico ao mais genérico (RegExp do JS)
+_PHONE_PATTERNS = (
+    r"\(19\)\s*\d{4,5}[-\s]?\d{4}",
+    r"19\s*\d{4,5}[-\s]?\d{4}",
+    r"\d{4,5}[-\s]?\d{4}",
+)
+
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
+# Seletores do link do site oficial no painel da empresa
+_WEBSITE_SELECTORS = (
+    '[data-attrid="kc:/local:all in one"] a[href*="http"]',
+    'a[data-dtype="d3ifr"]',
+    'a[ping*="website"]',
+)
+
+# Domínios que nunca são o site da empresa
+_NON_SITE_DOMAINS = (
+    "google.com",
+    "facebook.com",
+    "instagram.com",
+    "youtube.com",
+    "twitter.com",
+    "gstatic.com",
+    "googleapis.com",
+)
+
+# Palavras próximas a um link que indicam o site da empresa
+_SITE_KEYWORDS = ("site", "website", "página", "visitar")
+
+# Busca feita no navegador: só o resultado volta para o Python
+_JS_CAPTCHA = """([selectors, pattern]) => {
+    const selector = selectors.find((s) => document.querySelector(s));
+    if (selector) return ["seletor", selector];
+    const m = document.body.innerText.match(new RegExp(pattern, "i"));
+    return m ? ["texto", m[0]] : null;
+}"""
+
+_JS_HAS_PANEL = """() => !!document.querySelector(
+    "[data-attrid='kc:/local:all in one'], a[href*='facebook.com'], a[href*='instagram.com']"
+)"""
+
+_JS_HAS_SOCIAL_LINK = """() => !!document.querySelector(
+    "a[href*='facebook.com'], a[href*='instagram.com']"
+)"""
+
+# Extração completa do painel em uma única ida ao navegador: telefone
+# (aria-label "Ligar" ou texto), site oficial e link do Facebook/Instagram
+_JS_EXTRACT = """([phonePatterns, websiteSelectors, nonSiteDomains, siteKeywords]) => {
+    // Links de redirecionamento do Google: /url?url=... ou /url?q=...
+    const unwrap = (href) => {
+        if (href && href.startsWith("/url?")) {
+            const params = new URLSearchParams(href.slice(5));
+            return params.get("url") || params.get("q");
+        }
+        return href;
+    };
+
+    let phone = null;
+    const call = document.querySelector('[aria-label*="Ligar"]');
+    if (call) phone = call.getAttribute("aria-label").replace(/[^0-9]/g, "") || null;
+    if (!phone) {
+        const body = document.body.innerText;
+        for (const p of phonePatterns) {
+            const m = body.match(new RegExp(p));
+            if (m) { phone = m[0]; break; }
+        }
+    }
+
+    let site = null;
+    for (const s of websiteSelectors) {
+        const link = document.querySelector(s);
+        const href = link && link.getAttribute("href");
+        const ignored = ["google.com", "facebook.com", "instagram.com"];
+        if (href && !ignored.some((d) => href.includes(d))) {
+            site = unwrap(href);
+            if (site) break;
+        }
+    }
+    if (!site) {
+        for (const link of document.querySelectorAll("a[href*='http']")) {
+            const href = unwrap(link.getAttribute("href"));
+            if (!href || nonSiteDomains.some((d) => href.includes(d))) continue;
+            const parent = link.parentElement;
+            const text = parent ? parent.innerText.toLowerCase() : "";
+            if (siteKeywords.some((k) => text.includes(k))) { site = href; break; }
+        }
+    }
+
+    let facebook = null;
+    for (const link of document.querySelectorAll("a[href]")) {
+        const href = unwrap(link.getAttribute("href"));
+        if (!href || !(href.includes("facebook.com") || href.includes("instagram.com"))) {
+            continue;
+        }
+        const clean = href.split("?")[0].split("#")[0];
+        if (!clean.includes("/posts/") && !clean.includes("/p/")) { facebook = clean; break; }
+    }
+
+    return { phone, site, facebook };
+}"""
+
 
 class CaptchaDetectedException(Exception):
     """Exceção levantada quando um CAPTCHA é detectado."""
@@ -27,13 +203,21 @@ class CaptchaDetectedException(Exception):
 class GoogleScraper:
     """Scraper para extrair informações do Google Meu Negócio com detecção de CAPTCHA."""
 
-    def __init__(self, headless: bool = True, slow_mo: int = 2000):
+    # Playwright e browser compartilhados por todas as instâncias do mesmo event
+    # loop; cada instância abre apenas o seu próprio contexto
+    _playwright = None
+    _browser = None
+    _browser_loop = None
+    _browser_options = None
+
+    def __init__(self, headless: bool = True, slow_mo: int = 0):
         """
         Inicializa o Google Scraper.
 
         Args:
             headless: Se True, executa em modo headless (sem interface gráfica)
-            slow_mo: Delay em ms entre ações (ajuda a evitar CAPTCHA)
+            slow_mo: Delay em ms aplicado a toda ação do Playwright (0 = desligado;
+                as pausas anti-CAPTCHA são feitas só onde importam)
         """
         self.headless = headless
         self.slow_mo = slow_mo
@@ -42,6 +226,14 @@ class GoogleScraper:
         self.captcha_callback = None
         self._captcha_detected = False
 
+        # CAPTCHAs aguardando resolução manual, atendidos um por vez
+        # (o worker só é criado no primeiro CAPTCHA)
+        self._captcha_queue = None
+        self._captcha_task = None
+
+        # Resultados já buscados, pelo nome normalizado da empresa
+        self._cache: Dict[str, Dict[str, Optional[str]]] = {}
+
     def set_captcha_callback(self, callback: Callable):
         """
         Define callback para notificar a UI quando CAPTCHA é detectado.
@@ -51,27 +243,95 @@ class GoogleScraper:
         """
         self.captcha_callback = callback
 
-    async def __aenter__(self):
-        """Inicializa o browser ao entrar no contexto."""
-        self.playwright = await async_playwright().start()
+    @classmethod
+    async def ensure_browser(cls, headless: bool, slow_mo: int) -> Browser:
+        """
+        Retorna o browser compartilhado, iniciando o Playwright só no primeiro uso.
+        Um novo browser é lançado se as opções mudarem ou se o event loop atual
+        não for o mesmo em que o browser foi criado.
+
+        Args:
+            headless: Se True, executa em modo headless
+            slow_mo: Delay em ms entre ações
 
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=self.slow_mo,
-            args=[
+        Returns:
+            Browser do Playwright
+        """
+        loop = asyncio.get_running_loop()
+        options = (headless, slow_mo)
+
+        if cls._browser is not None and (
+            cls._browser_loop is not loop
+            or cls._browser_options != options
+            or not cls._browser.is_connected()
+        ):
+            if cls._browser_loop is loop:
+                await cls.shutdown()
+            else:
+                # Objetos presos a um loop já encerrado não podem ser reutilizados
+                cls._playwright = cls._browser = None
+
+        if cls._browser is None:
+            args = [
                 "--disable-blink-features=AutomationControlled",
                 "--disable-dev-shm-usage",
                 "--no-sandbox",
-            ],
-        )
+            ]
+
+            # Headless nativo do Chromium: browser completo, sem o "HeadlessChrome"
+            # que o modo headless antigo expõe nos headers
+            if headless:
+                args.append("--headless=new")
+
+            cls._playwright = await async_playwright().start()
+            cls._browser = await cls._playwright.chromium.launch(
+                headless=False, slow_mo=slow_mo, args=args
+            )
+            cls._browser_loop = loop
+            cls._browser_options = options
+
+        return cls._browser
+
+    @classmethod
+    async def shutdown(cls):
+        """Fecha o browser e o Playwright compartilhados (chamar ao fim da execução)."""
+        browser, playwright = cls._browser, cls._playwright
+        cls._browser = cls._playwright = None
+        cls._browser_loop = cls._browser_options = None
+
+        if browser:
+            await browser.close()
+        if playwright:
+            await playwright.stop()
+
+    async def __aenter__(self):
+        """Abre um contexto no browser compartilhado ao entrar no contexto."""
+        self.browser = await self.ensure_browser(self.headless, self.slow_mo)
+
+        # Sorteia um perfil para não repetir sempre a mesma impressão digital
+        version, (width, height), accept_language = random.choice(_FINGERPRINTS)
 
         self.context = await self.browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+            viewport={"width": width, "height": height},
+            user_agent=_USER_AGENT.format(version),
             locale="pt-BR",
             timezone_id="America/Sao_Paulo",
         )
 
+        # Headers fixos do perfil, enviados por todas as páginas do contexto
+        await self.context.set_extra_http_headers(
+            {
+                "Accept-Language": accept_language,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+                "sec-ch-ua": _SEC_CH_UA[version],
+                "sec-ch-ua-mobile": "?0",
+                "sec-ch-ua-platform": _PLATFORM,
+            }
+        )
+
+        # Só documento, scripts e XHR: imagens, fontes, mídia e CSS são abortados
+        await self.context.route("**/*", self._block_resources)
+
         await self.context.add_init_script(
             """
             Object.defineProperty(navigator, 'webdriver', {
@@ -82,27 +342,92 @@ class GoogleScraper:
 
         return self
 
+    @staticmethod
+    async def _block_resources(route: Route):
+        """Aborta requisições de recursos que não são usados na extração."""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Fecha o browser ao sair do contexto."""
+        """Fecha apenas o contexto; o browser continua disponível para reuso."""
+        if self._captcha_task:
+            self._captcha_task.cancel()
+            try:
+                await self._captcha_task
+            except asyncio.CancelledError:
+                pass
+            self._captcha_task = None
+            self._captcha_queue = None
+
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+            self.context = None
 
-    async def search_company(self, nome_empresa: str) -> Dict[str, Optional[str]]:
+    async def search_company(
+        self, nome_empresa: str, slot: Optional[asyncio.Semaphore] = None
+    ) -> Dict[str, Optional[str]]:
         """
         Pesquisa uma empresa no Google e extrai informações.
+        Falhas transitórias (timeouts) são repetidas com backoff exponencial.
+
+        Args:
+            nome_empresa: Nome fantasia da empresa
+            slot: Vaga de search_companies segurada por esta busca, liberada
+                enquanto um CAPTCHA aguarda resolução manual
+
+        Returns:
+            Dict com telefone, facebook_link e site
+
+        Raises:
+            CaptchaDetectedException: Se um CAPTCHA for detectado
+        """
+        key = nome_empresa.strip().casefold()
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info(f"Resultado em cache para {nome_empresa}")
+            return dict(cached)
+
+        for attempt in range(1, SEARCH_ATTEMPTS + 1):
+            try:
+                result = await self._search_once(nome_empresa, slot)
+            except CaptchaDetectedException:
+                raise
+            except PlaywrightTimeout as e:
+                logger.warning(
+                    f"Timeout ao buscar {nome_empresa} "
+                    f"(tentativa {attempt}/{SEARCH_ATTEMPTS}): {e}"
+                )
+                if attempt < SEARCH_ATTEMPTS:
+                    await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            except Exception as e:
+                logger.error(f"Erro ao buscar {nome_empresa}: {str(e)}")
+                break
+            else:
+                # Só buscas concluídas sem erro entram no cache
+                self._cache[key] = dict(result)
+                return result
+
+        return {"telefone": None, "facebook_link": None, "site": None}
+
+    async def _search_once(
+        self, nome_empresa: str, slot: Optional[asyncio.Semaphore] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Faz uma tentativa de busca, em uma página nova.
 
         Args:
             nome_empresa: Nome fantasia da empresa
+            slot: Vaga de search_companies segurada por esta busca, liberada
+                enquanto um CAPTCHA aguarda resolução manual
 
         Returns:
             Dict com telefone, facebook_link e site
 
         Raises:
             CaptchaDetectedException: Se um CAPTCHA for detectado
+            PlaywrightTimeout: Se a página ou os resultados não carregarem a tempo
         """
         result = {"telefone": None, "facebook_link": None, "site": None}
 
@@ -112,21 +437,18 @@ class GoogleScraper:
             search_query = f'"{nome_empresa}" Mogi Mirim'
             logger.info(f"Buscando: {search_query}")
 
-            await page.set_extra_http_headers(
-                {
-                    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                }
+            # Retorna assim que a resposta chega; o que importa é aguardado abaixo
+            response = await page.goto(
+                SEARCH_URL + urlencode({"q": search_query, "hl": "pt-BR", "gl": "br"}),
+                wait_until="commit",
             )
 
-            await page.goto(
-                f"https://www.google.com/search?q={search_query}",
-                wait_until="domcontentloaded",
-            )
-
-            await asyncio.sleep(random.uniform(1, 2))
-
-            captcha_detected = await self._check_for_captcha(page)
+            # Status de bloqueio já chega com a resposta: não espera seletores
+            ready = False
+            captcha_detected = self._blocked_by_status(response)
+            if not captcha_detected:
+                ready = await self._wait_for_results(page)
+                captcha_detected = await self._check_for_captcha(page)
 
             if captcha_detected:
                 self._captcha_detected = True
@@ -143,29 +465,105 @@ class GoogleScraper:
                     )
 
                 logger.warning("CAPTCHA detectado! Aguardando intervenção humana...")
-                await self._wait_for_human_intervention(page, nome_empresa)
+                await self._resolve_captcha(page, nome_empresa, slot)
                 self._captcha_detected = False
 
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(1)
-            await page.evaluate("window.scrollTo(0, 0)")
-            await asyncio.sleep(1)
+            elif not ready:
+                raise PlaywrightTimeout("Resultados da busca não carregaram a tempo")
+
+            await self._wait_for_panel(page)
+
+            # Com wait_until="commit" o HTML ainda pode estar chegando; a
+            # extração precisa do documento inteiro (links orgânicos no fim)
+            await page.wait_for_load_state("domcontentloaded")
 
-            result["telefone"] = await self._extract_phone(page)
-            result["site"] = await self._extract_website(page)
-            result["facebook_link"] = await self._extract_facebook_link(page)
+            result.update(await self._extract_data(page))
 
             logger.info(f"Dados extraídos para {nome_empresa}: {result}")
 
-        except CaptchaDetectedException:
-            raise
-        except Exception as e:
-            logger.error(f"Erro ao buscar {nome_empresa}: {str(e)}")
         finally:
             await page.close()
 
         return result
 
+    async def search_companies(
+        self, names: List[str], concurrency: int = 8
+    ) -> List[Union[Dict[str, Optional[str]], BaseException]]:
+        """
+        Pesquisa várias empresas em paralelo, uma página por busca no mesmo contexto.
+
+        Args:
+            names: Nomes fantasia das empresas
+            concurrency: Quantidade máxima de buscas simultâneas
+
+        Returns:
+            Lista na mesma ordem de names, com o dict de cada busca ou a exceção
+            levantada (ex.: CaptchaDetectedException) sem cancelar as demais
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def bounded(nome_empresa: str) -> Dict[str, Optional[str]]:
+            # A vaga segue junto com a busca: só quem a segura pode liberá-la
+            async with sem:
+                return await self.search_company(nome_empresa, sem)
+
+        return await asyncio.gather(
+            *(bounded(nome) for nome in names), return_exceptions=True
+        )
+
+    @staticmethod
+    async def _wait_for_results(page: Page) -> bool:
+        """
+        Aguarda os resultados da busca ou a página de CAPTCHA, o que vier antes.
+
+        Returns:
+            False se nenhum dos dois apareceu em RESULTS_TIMEOUT ms
+        """
+        try:
+            await page.wait_for_selector(
+                RESULTS_SELECTOR, state="attached", timeout=RESULTS_TIMEOUT
+            )
+            return True
+        except PlaywrightTimeout:
+            logger.debug("Resultados da busca não detectados a tempo")
+            return False
+
+    @staticmethod
+    async def _wait_for_panel(page: Page):
+        """
+        Aguarda o painel da empresa ou um link do Facebook/Instagram aparecer.
+        Depois rola a página (com pausas curtas) se ainda não houver link do
+        Facebook/Instagram, mesmo com o painel renderizado, para forçar o
+        carregamento dos links mais abaixo.
+        """
+        try:
+            await page.wait_for_function(_JS_HAS_PANEL, timeout=PANEL_TIMEOUT)
+        except PlaywrightTimeout:
+            logger.debug("Painel da empresa não detectado a tempo")
+
+        if not await page.evaluate(_JS_HAS_SOCIAL_LINK):
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await asyncio.sleep(random.uniform(*SCROLL_PAUSE))
+            await page.evaluate("window.scrollTo(0, 0)")
+            await asyncio.sleep(random.uniform(*SCROLL_PAUSE))
+
+    @staticmethod
+    def _blocked_by_status(response: Optional[Response]) -> bool:
+        """
+        Verifica o status HTTP da navegação, antes de qualquer acesso ao DOM.
+
+        Args:
+            response: Resposta da navegação (page.goto), se disponível
+
+        Returns:
+            True se o status indica a página de bloqueio
+        """
+        # O Google responde a página de bloqueio com 403/429/503
+        if response is not None and response.status in CAPTCHA_STATUS:
+            logger.warning(f"CAPTCHA detectado via status HTTP: {response.status}")
+            return True
+        return False
+
     async def _check_for_captcha(self, page: Page) -> bool:
         """
         Verifica se um CAPTCHA foi detectado na página.
@@ -177,32 +575,14 @@ class GoogleScraper:
             True se CAPTCHA foi detectado, False caso contrário
         """
         try:
-            captcha_indicators = [
-                "form#captcha-form",
-                "#captcha-form",
-                "div.g-recaptcha",
-                'iframe[src*="recaptcha"]',
-            ]
-
-            for selector in captcha_indicators:
-                captcha_element = await page.query_selector(selector)
-                if captcha_element:
-                    logger.warning(f"CAPTCHA detectado via seletor: {selector}")
-                    return True
-
-            content = await page.content()
-            captcha_texts = [
-                "unusual traffic",
-                "tráfego incomum",
-                "sistemas automatizados",
-                "automated queries",
-                "Our systems have detected unusual traffic",
-            ]
-
-            for text in captcha_texts:
-                if text.lower() in content.lower():
-                    logger.warning(f"CAPTCHA detectado via texto: {text}")
-                    return True
+            # Seletores e textos verificados em uma única ida ao navegador
+            hit = await page.evaluate(
+                _JS_CAPTCHA, [list(_CAPTCHA_SELECTORS), _CAPTCHA_PATTERN]
+            )
+            if hit:
+                via, indicator = hit
+                logger.warning(f"CAPTCHA detectado via {via}: {indicator}")
+                return True
 
             return False
 
@@ -210,6 +590,55 @@ class GoogleScraper:
             logger.debug(f"Erro ao verificar CAPTCHA: {e}")
             return False
 
+    async def _resolve_captcha(
+        self,
+        page: Page,
+        nome_empresa: str,
+        slot: Optional[asyncio.Semaphore] = None,
+    ):
+        """
+        Enfileira o CAPTCHA para o worker de resolução manual e aguarda a vez.
+        Enquanto espera, a vaga de search_companies fica livre para outras buscas.
+
+        Args:
+            page: Página do Playwright com o CAPTCHA
+            nome_empresa: Nome da empresa sendo processada
+            slot: Vaga segurada pela busca, devolvida ao final da espera
+        """
+        if self._captcha_task is None:
+            self._captcha_queue = asyncio.Queue()
+            self._captcha_task = asyncio.create_task(self._captcha_worker())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._captcha_queue.put((page, nome_empresa, future))
+
+        if slot is not None:
+            slot.release()
+
+        try:
+            await future
+        finally:
+            if slot is not None:
+                await slot.acquire()
+
+    async def _captcha_worker(self):
+        """Atende os CAPTCHAs enfileirados um por vez, na ordem de detecção."""
+        while True:
+            page, nome_empresa, future = await self._captcha_queue.get()
+
+            # A busca pode ter sido cancelada enquanto aguardava na fila
+            if future.done():
+                continue
+
+            try:
+                await self._wait_for_human_intervention(page, nome_empresa)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(None)
+
     async def _wait_for_human_intervention(self, page: Page, nome_empresa: str):
         """
         Aguarda intervenção humana para resolver o CAPTCHA.
@@ -241,125 +670,41 @@ class GoogleScraper:
                 "Timeout ao aguardar resolução manual do CAPTCHA"
             )
 
-    async def _extract_phone(self, page: Page) -> Optional[str]:
-        """Extrai o número de telefone do widget do Google."""
-        try:
-            phone_button = await page.query_selector('[aria-label*="Ligar"]')
-            if phone_button:
-                aria_label = await phone_button.get_attribute("aria-label")
-                phone = re.sub(r"[^\d]", "", aria_label)
-                if phone:
-                    return self._format_phone(phone)
-
-            phone_patterns = [
-                r"\(19\)\s*\d{4,5}[-\s]?\d{4}",
-                r"19\s*\d{4,5}[-\s]?\d{4}",
-                r"\d{4,5}[-\s]?\d{4}",
-            ]
-
-            content = await page.content()
-            for pattern in phone_patterns:
-                match = re.search(pattern, content)
-                if match:
-                    phone = re.sub(r"[^\d]", "", match.group())
-                    return self._format_phone(phone)
+    async def _extract_data(self, page: Page) -> Dict[str, Optional[str]]:
+        """
+        Extrai telefone, site e link do Facebook/Instagram do painel do Google
+        com um único page.evaluate.
 
-        except Exception as e:
-            logger.debug(f"Erro ao extrair telefone: {str(e)}")
+        Args:
+            page: Página do Playwright com os resultados da busca
 
-        return None
+        Returns:
+            Dict com telefone, site e facebook_link (None no que não for encontrado)
+        """
+        data = {"telefone": None, "site": None, "facebook_link": None}
 
-    async def _extract_website(self, page: Page) -> Optional[str]:
-        """Extrai o link do site oficial do widget do Google."""
         try:
-            selectors = [
-                '[data-attrid="kc:/local:all in one"] a[href*="http"]',
-                'a[data-dtype="d3ifr"]',
-                'a[ping*="website"]',
-            ]
-
-            for selector in selectors:
-                website_link = await page.query_selector(selector)
-                if website_link:
-                    href = await website_link.get_attribute("href")
-                    if (
-                        href
-                        and "google.com" not in href
-                        and "facebook.com" not in href
-                        and "instagram.com" not in href
-                    ):
-                        if href.startswith("/url?"):
-                            parsed = parse_qs(urlparse(href).query)
-                            href = parsed.get("url", [parsed.get("q", [None])[0]])[0]
-                        if href:
-                            return href
-
-            all_links = await page.query_selector_all("a[href*='http']")
-            for link in all_links:
-                href = await link.get_attribute("href")
-                if not href:
-                    continue
-
-                if href.startswith("/url?"):
-                    parsed = parse_qs(urlparse(href).query)
-                    href = parsed.get("url", [parsed.get("q", [None])[0]])[0]
-
-                if href and all(
-                    domain not in href
-                    for domain in [
-                        "google.com",
-                        "facebook.com",
-                        "instagram.com",
-                        "youtube.com",
-                        "twitter.com",
-                        "gstatic.com",
-                        "googleapis.com",
-                    ]
-                ):
-                    parent_text = ""
-                    try:
-                        parent = await link.evaluate_handle("el => el.parentElement")
-                        parent_text = await parent.inner_text()
-                    except:
-                        pass
-
-                    if any(
-                        keyword in parent_text.lower()
-                        for keyword in ["site", "website", "página", "visitar"]
-                    ):
-                        return href
-
+            found = await page.evaluate(
+                _JS_EXTRACT,
+                [
+                    list(_PHONE_PATTERNS),
+                    list(_WEBSITE_SELECTORS),
+                    list(_NON_SITE_DOMAINS),
+                    list(_SITE_KEYWORDS),
+                ],
+            )
         except Exception as e:
-            logger.debug(f"Erro ao extrair website: {str(e)}")
-
-        return None
-
-    async def _extract_facebook_link(self, page: Page) -> Optional[str]:
-        """Extrai o link do Facebook/Instagram independentemente do layout."""
-        try:
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(1)
+            logger.debug(f"Erro ao extrair dados do Google: {e}")
+            return data
 
-            all_links = await page.query_selector_all("a[href]")
+        phone = _NON_DIGIT_RE.sub("", found["phone"] or "")
+        if phone:
+            data["telefone"] = self._format_phone(phone)
 
-            for link in all_links:
-                href = await link.get_attribute("href")
-                if not href:
-                    continue
-
-                if href.startswith("/url?"):
-                    parsed = parse_qs(urlparse(href).query)
-                    href = parsed.get("url", [parsed.get("q", [None])[0]])[0]
-
-                if href and ("facebook.com" in href or "instagram.com" in href):
-                    clean_url = href.split("?")[0].split("#")[0]
-                    if "/posts/" not in clean_url and "/p/" not in clean_url:
-                        return clean_url
-
-        except Exception as e:
-            logger.debug(f"Erro ao extrair Facebook/Instagram: {e}")
+        data["site"] = found["site"]
+        data["facebook_link"] = found["facebook"]
 
-        return None
+        return data
 
     @staticmethod
     def _format_phone(phone: str) -> str:
@@ -372,7 +717,7 @@ class GoogleScraper:
         Returns:
             Telefone formatado
         """
-        phone = re.sub(r"[^\d]", "", phone)
+        phone = _NON_DIGIT_RE.sub("", phone)
 
         if len(phone) == 11:
             return f"({phone[:2]}) {phone[2:7]}-{phone[7:]}"
@@ -6,6 +6,14 @@ from textual.widgets import Header, Footer, DataTable, Static
 from textual.containers import Vertical
 from textual.app import ComposeResult
 
+# Colunas da tabela de dados: (rótulo, chave)
+TABLE_COLUMNS = (
+    ("Empresa", "empresa"),
+    ("Telefone", "tel"),
+    ("Facebook", "fb"),
+    ("Status", "status"),
+)
+
 
 class ExtractMogiWidget(Static):
     """Widget principal da aplicação ExtractMogi."""
@@ -26,7 +34,8 @@ class ExtractMogiWidget(Static):
         """Executado quando o widget é montado."""
         # Configura a tabela de dados
         table = self.query_one(DataTable)
-        table.add_columns("Empresa", "Telefone", "Facebook", "Status")
+        for label, key in TABLE_COLUMNS:
+            table.add_column(label, key=key)
         table.zebra_stripes = True
         table.cursor_type = "row"
         table.show_header = True